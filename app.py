@@ -1,11 +1,13 @@
 """
-Main Flask application for the Job Data Ingestion & Enrichment Pipeline.
+Main FastAPI application for the Job Data Ingestion & Enrichment Pipeline.
 """
-import asyncio
 import logging
-import os
-from flask import Flask, request, jsonify
-from src.config import Config
+import time
+from contextlib import asynccontextmanager
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from src.config import settings
 from src.pipeline import JobPipeline
 
 # Configure logging
@@ -15,140 +17,162 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Initialize Flask app
-app = Flask(__name__)
-
-# Initialize pipeline
+# Pipeline instance, built once per worker by the lifespan handler
 pipeline = None
 
+# A successful database probe is trusted for this many seconds
+HEALTH_CHECK_TTL = 5
+_last_health_ok = 0.0
 
-def get_pipeline():
-    """Get or create pipeline instance."""
-    global pipeline
+
+def get_pipeline() -> JobPipeline:
+    """Return the pipeline instance built at startup."""
     if pipeline is None:
-        try:
-            Config.validate()
-            pipeline = JobPipeline()
-            logger.info("Pipeline initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize pipeline: {e}")
-            raise
+        raise RuntimeError("Pipeline is not initialized")
     return pipeline
 
 
-@app.route('/health', methods=['GET'])
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the pipeline once per worker and close its pooled clients when the worker stops."""
+    global pipeline
+    try:
+        pipeline = JobPipeline()
+        await pipeline.start()
+        logger.info("Pipeline initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize pipeline: {e}")
+        raise
+    try:
+        yield
+    finally:
+        await pipeline.aclose()
+
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="Job Data Ingestion Pipeline",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
+
+@app.get('/health')
 def health():
     """Health check endpoint."""
+    global _last_health_ok
     try:
-        # Test database connection
+        # Test database connection, reusing a recent successful probe
         pipeline_instance = get_pipeline()
-        pipeline_instance.db_service.get_existing_job_hashes()
-        
-        return jsonify({
+        if time.monotonic() - _last_health_ok >= HEALTH_CHECK_TTL:
+            pipeline_instance.db_service.ping()
+            _last_health_ok = time.monotonic()
+
+        return ORJSONResponse({
             "status": "healthy",
             "service": "Job Data Ingestion Pipeline",
             "version": "1.0.0"
-        }), 200
+        }, status_code=200)
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return jsonify({
+        return ORJSONResponse({
             "status": "unhealthy",
             "error": str(e)
-        }), 500
+        }, status_code=500)
 
 
-@app.route('/process', methods=['POST'])
-def process_job_feed():
+@app.post('/process')
+async def process_job_feed(request: Request):
     """
     Process a job feed through the complete ETL pipeline.
-    
+
     Expected JSON payload:
     {
         "input_path": "https://example.com/jobs.xml" or "/path/to/local/file.csv"
     }
     """
+    data = None
     try:
         # Get request data
-        data = request.get_json()
-        if not data or 'input_path' not in data:
-            return jsonify({
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        if not isinstance(data, dict) or 'input_path' not in data:
+            return ORJSONResponse({
                 "error": "Missing 'input_path' in request body"
-            }), 400
-        
+            }, status_code=400)
+
         input_path = data['input_path']
         logger.info(f"Processing job feed: {input_path}")
-        
+
         # Get pipeline instance
         pipeline_instance = get_pipeline()
-        
-        # Run the pipeline asynchronously
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            results = loop.run_until_complete(pipeline_instance.process_feed(input_path))
-        finally:
-            loop.close()
-        
+
+        # Run the pipeline on the server's event loop
+        results = await pipeline_instance.process_feed(input_path)
+
         # Return results
         if results['success']:
             logger.info(f"Pipeline completed successfully: {results}")
-            return jsonify(results), 200
+            return ORJSONResponse(results, status_code=200)
         else:
             logger.error(f"Pipeline failed: {results}")
-            return jsonify(results), 500
-            
+            return ORJSONResponse(results, status_code=500)
+
     except Exception as e:
         logger.error(f"Error processing job feed: {e}")
-        return jsonify({
+        return ORJSONResponse({
             "success": False,
             "error": str(e),
-            "input_path": data.get('input_path', 'unknown') if 'data' in locals() else 'unknown'
-        }), 500
+            "input_path": data.get('input_path', 'unknown') if isinstance(data, dict) else 'unknown'
+        }, status_code=500)
 
 
-@app.route('/status', methods=['GET'])
+@app.get('/status')
 def get_status():
     """Get pipeline status and queue information."""
     try:
         pipeline_instance = get_pipeline()
         queue_status = pipeline_instance.review_queue.get_queue_status()
-        
-        return jsonify({
+
+        return ORJSONResponse({
             "pipeline_status": "ready",
-            "confidence_threshold": Config.CONFIDENCE_THRESHOLD,
+            "confidence_threshold": settings.confidence_threshold,
             "review_queue": queue_status
-        }), 200
-        
+        }, status_code=200)
+
     except Exception as e:
         logger.error(f"Error getting status: {e}")
-        return jsonify({
+        return ORJSONResponse({
             "error": str(e)
-        }), 500
+        }, status_code=500)
 
 
-@app.route('/queue', methods=['GET'])
+@app.get('/queue')
 def get_review_queue():
     """Get the current manual review queue."""
     try:
         pipeline_instance = get_pipeline()
         queue_data = pipeline_instance.review_queue.load_review_queue()
-        
-        return jsonify({
+
+        return ORJSONResponse({
             "queue": queue_data,
             "total_items": len(queue_data)
-        }), 200
-        
+        }, status_code=200)
+
     except Exception as e:
         logger.error(f"Error getting review queue: {e}")
-        return jsonify({
+        return ORJSONResponse({
             "error": str(e)
-        }), 500
+        }, status_code=500)
 
 
-@app.errorhandler(404)
-def not_found(error):
+@app.exception_handler(404)
+async def not_found(request: Request, exc: Exception):
     """Handle 404 errors."""
-    return jsonify({
+    return ORJSONResponse({
         "error": "Endpoint not found",
         "available_endpoints": [
             "GET /health - Health check",
@@ -156,19 +180,18 @@ def not_found(error):
             "GET /status - Get pipeline status",
             "GET /queue - Get review queue"
         ]
-    }), 404
+    }, status_code=404)
 
 
-@app.errorhandler(500)
-def internal_error(error):
+@app.exception_handler(500)
+async def internal_error(request: Request, exc: Exception):
     """Handle 500 errors."""
-    logger.error(f"Internal server error: {error}")
-    return jsonify({
+    logger.error(f"Internal server error: {exc}")
+    return ORJSONResponse({
         "error": "Internal server error",
-        "message": str(error)
-    }), 500
+        "message": str(exc)
+    }, status_code=500)
 
 
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 8080))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+    uvicorn.run("app:app", host='0.0.0.0', port=settings.port, loop='uvloop')
@@ -1,146 +1,354 @@
 """
-AI service for job enrichment using Deepseek API.
+AI service for job enrichment using a pluggable chat-completion provider.
 """
-import json
+import re
 import asyncio
+import hashlib
 import logging
 import httpx
-from typing import Dict, Any, List, Optional
-from .config import Config
+import orjson
+from collections import OrderedDict, deque
+from typing import Dict, Any, Callable, List, Optional, Tuple
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on cached industry classifications kept per service instance.
+_INDUSTRY_CACHE_MAXSIZE = 2048
+
+# Transient key holding a job's truncated description while it is enriched.
+_DESC_SHORT_KEY = '_desc_short'
+_DESC_SHORT_LEN = 1000
+
+_INDUSTRY_PROMPT_TMPL = """Analyze this job listing and return a JSON object with sector, industry_group, industry, and industry_id fields.
+
+Job Title: {title}
+Company: {company}
+Description: {desc}...
+
+Return format: {{"sector": "Technology", "industry_group": "Software & IT Services", "industry": "Software", "industry_id": 501}}
+Return only valid JSON, no other text."""
+
+_ATTRS_PROMPT_TMPL = """Based on the following job data, generate a structured JSON object containing these fields:
+- ai_title: Improved, standardized job title
+- ai_description: Clean, professional job description (2-3 sentences)
+- ai_job_tasks: Array of 3-5 key job responsibilities
+- ai_search_terms: Array of relevant search keywords
+- ai_top_tags: Array of 3-5 most important skills/technologies
+- ai_job_function_id: Numeric ID representing job function (100-999)
+- ai_skills: Array of specific skills required
+- ai_confidence_score: Float between 0.0 and 1.0 indicating parsing confidence
+
+Job Data:
+- Title: {title}
+- Company: {company}
+- Description: {desc}...
+- Industry: {industry}
+
+Return only valid JSON format, no other text."""
+
+# Finds, in one left-to-right search, either a JSON object wrapped in a
+# markdown code fence (group 1) or the opening brace of a bare object. Bare
+# objects are delimited by _extract_json_object rather than a greedy pattern.
+_EXTRACT_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```|\{', re.DOTALL)
+
+
+def _extract_json_object(text: str, start: int = 0) -> Optional[str]:
+    """
+    Return the first balanced {...} object in text at or after start, or None.
+
+    Walks the string once tracking brace depth and JSON string state, so it
+    stays linear on large or malformed responses.
+    """
+    start = text.find('{', start)
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return None
+
+
+def _industry_cache_key(job: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Build a constant-size cache key from a job's title and description."""
+    description = job.get('description') or ''
+    return (
+        job.get('title') or '',
+        hashlib.blake2b(description.encode('utf-8'), digest_size=16).digest()
+    )
+
+
+def _short_description(job: Dict[str, Any]) -> str:
+    """Return the job's truncated description, computing and storing it once."""
+    desc = job.get(_DESC_SHORT_KEY)
+    if desc is None:
+        desc = job[_DESC_SHORT_KEY] = (job.get('description') or '')[:_DESC_SHORT_LEN]
+    return desc
+
+
+def _loads_dict(json_text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Decode json_text, returning the result only if it is a dict."""
+    if not json_text:
+        return None
+    try:
+        parsed = orjson.loads(json_text)
+    except orjson.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+class DeepseekProvider:
+    """Chat-completion provider backed by the Deepseek API."""
+    
+    def __init__(self, api_key: str, base_url: str = "https://api.deepseek.com/v1"):
+        """Initialize the Deepseek client."""
+        self.api_key = api_key
+        self.base_url = base_url
+        # One pooled client for the lifetime of the provider so keep-alive
+        # connections are reused across calls instead of a handshake per job.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=60)
+        )
+    
+    async def chat(self, prompt: str, timeout: int = 30) -> str:
+        """Send a single-turn prompt and return the model's reply text."""
+        payload = {
+            "model": "deepseek-chat",
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": 1000
+        }
+        
+        # httpx applies timeout to each connect/read/write step; wait_for bounds
+        # the whole request so a slowly trickling response cannot stall a batch.
+        response = await asyncio.wait_for(
+            self._client.post("/chat/completions", json=payload, timeout=timeout),
+            timeout=timeout
+        )
+        response.raise_for_status()
+        
+        result = orjson.loads(response.content)
+        return result["choices"][0]["message"]["content"]
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self._client.aclose()
+
+
+def _create_provider(name: str):
+    """Build the chat provider selected by configuration."""
+    if name == 'deepseek':
+        return DeepseekProvider(settings.deepseek_api_key)
+    raise ValueError(f"Unsupported AI provider: {name}")
+
 
 class AIService:
-    """Service for AI-powered job enrichment using Deepseek API."""
+    """Service for AI-powered job enrichment."""
     
     def __init__(self):
-        """Initialize the Deepseek client."""
-        self.api_key = Config.DEEPSEEK_API_KEY
-        self.base_url = "https://api.deepseek.com/v1"
-        self._industry_cache = {}
-        self._industry_batch = []
+        """Initialize the configured AI provider."""
+        self._provider = _create_provider(settings.ai_provider)
+        self._industry_cache = OrderedDict()
+        # In-flight classification requests by cache key; jobs with the same
+        # key await the first request instead of sending their own
+        self._industry_pending = {}
         self._batch_limit = 5
+        # Pending (job, on_classified) pairs; a full batch is dispatched immediately.
+        self._industry_batch = deque(maxlen=self._batch_limit)
+        self._batch_tasks = set()
+        # Caps in-flight classification requests across all dispatched batches.
+        self._request_semaphore = asyncio.Semaphore(self._batch_limit)
     
-    def add_job_for_industry_classification(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Add a job to the batch for industry classification."""
-        job_key = (job.get('title'), job.get('description'))
-        if job_key in self._industry_cache:
+    def add_job_for_industry_classification(
+        self,
+        job: Dict[str, Any],
+        on_classified: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Add a job to the batch for industry classification.
+        
+        When the batch reaches its limit it is dispatched in the background;
+        call flush() to process the remainder and wait for all batches.
+        
+        Args:
+            job: The job to classify.
+            on_classified: Optional callback invoked with the job once its
+                classification (or the default fallback) has been applied.
+            
+        Returns:
+            The cached classification if one exists (the job is not queued), else None.
+        """
+        _short_description(job)
+        cached = self._get_cached_industry(_industry_cache_key(job))
+        if cached is not None:
             logger.info(f"Industry cache hit for job title: {job.get('title')}")
-            return self._industry_cache[job_key]
+            return cached
         
-        self._industry_batch.append(job)
+        self._industry_batch.append((job, on_classified))
         logger.info(f"Added job '{job.get('title')}' to industry batch. Current batch size: {len(self._industry_batch)}")
+        
+        if len(self._industry_batch) >= self._batch_limit:
+            task = asyncio.create_task(self._classify_batch(self._take_batch()))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
         return None
     
+    def _take_batch(self) -> List[Tuple[Dict[str, Any], Optional[Callable[[Dict[str, Any]], None]]]]:
+        """Remove and return everything currently queued for classification."""
+        batch = list(self._industry_batch)
+        self._industry_batch.clear()
+        return batch
+    
+    def _get_cached_industry(self, job_key: Tuple[str, bytes]) -> Optional[Dict[str, Any]]:
+        """Look up a cached classification, marking it as recently used."""
+        classification = self._industry_cache.get(job_key)
+        if classification is not None:
+            self._industry_cache.move_to_end(job_key)
+        return classification
+    
+    def _cache_industry(self, job_key: Tuple[str, bytes], classification: Dict[str, Any]) -> None:
+        """Cache a classification, evicting the least recently used entry when full."""
+        self._industry_cache[job_key] = classification
+        self._industry_cache.move_to_end(job_key)
+        if len(self._industry_cache) > _INDUSTRY_CACHE_MAXSIZE:
+            self._industry_cache.popitem(last=False)
+    
     def _parse_ai_response(self, response_text: str) -> Dict[str, Any]:
         """Parse AI response text to JSON, handling potential formatting issues."""
+        text = response_text.strip()
+        
+        # Try to parse as JSON directly (the common case)
         try:
-            # Try to parse as JSON directly
-            parsed = json.loads(response_text)
+            parsed = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+        else:
             # Ensure it's a dictionary
             if isinstance(parsed, dict):
                 return parsed
-            else:
-                logger.warning(f"Parsed JSON is not a dict: {type(parsed)}")
-                return {}
-        except json.JSONDecodeError:
-            # Try to extract JSON from markdown code blocks
-            if '```json' in response_text:
-                start = response_text.find('```json') + 7
-                end = response_text.find('```', start)
-                if end != -1:
-                    json_text = response_text[start:end].strip()
-                    try:
-                        parsed = json.loads(json_text)
-                        if isinstance(parsed, dict):
-                            return parsed
-                    except json.JSONDecodeError:
-                        pass
-            
-            # Try to extract JSON from the response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                try:
-                    parsed = json.loads(json_match.group())
-                    if isinstance(parsed, dict):
-                        return parsed
-                except json.JSONDecodeError:
-                    pass
-            
-            logger.error(f"Could not parse AI response as valid JSON dict: {response_text[:200]}...")
+            logger.warning(f"Parsed JSON is not a dict: {type(parsed)}")
             return {}
-    
-    async def _call_deepseek_api(self, prompt: str, timeout: int = 30) -> str:
-        """Call Deepseek API with the given prompt."""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
         
-        payload = {
-            "model": "deepseek-chat",
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "temperature": 0.1,
-            "max_tokens": 1000
-        }
+        # Try fenced code blocks and embedded objects in order of appearance
+        match = _EXTRACT_RE.search(text)
+        while match:
+            if match.group(1) is not None:
+                parsed = _loads_dict(match.group(1))
+                next_pos = match.end()
+            else:
+                json_text = _extract_json_object(text, match.start())
+                if json_text is None:
+                    # Unbalanced '{': a later fenced object may still parse
+                    match = _EXTRACT_RE.search(text, match.end())
+                    continue
+                parsed = _loads_dict(json_text)
+                next_pos = match.start() + len(json_text)
+            if parsed is not None:
+                return parsed
+            match = _EXTRACT_RE.search(text, next_pos)
         
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            
-            result = response.json()
-            return result["choices"][0]["message"]["content"]
+        logger.error(f"Could not parse AI response as valid JSON dict: {response_text[:200]}...")
+        return {}
+    
+    async def aclose(self) -> None:
+        """Release the provider's network resources."""
+        await self._provider.aclose()
     
     async def process_industry_batch(self) -> None:
-        """Process the current batch of jobs for industry classification."""
+        """Process the jobs currently queued for industry classification."""
         if not self._industry_batch:
             logger.info("Industry batch is empty. Nothing to process.")
             return
         
-        logger.info(f"Processing an industry batch of {len(self._industry_batch)} jobs individually")
+        await self._classify_batch(self._take_batch())
+    
+    async def flush(self) -> None:
+        """Process any queued jobs and wait for all dispatched batches to finish."""
+        await self.process_industry_batch()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks)
+    
+    async def _classify_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], Optional[Callable[[Dict[str, Any]], None]]]]
+    ) -> None:
+        """Classify a batch of jobs, one concurrent request per job."""
+        logger.info(f"Processing an industry batch of {len(batch)} jobs concurrently")
         
-        # Process each job individually instead of as a batch to avoid timeouts
-        for job in self._industry_batch:
-            job_key = (job.get('title'), job.get('description'))
-            if job_key in self._industry_cache:
+        async def _classify_one(job: Dict[str, Any]) -> None:
+            job_key = _industry_cache_key(job)
+            cached = self._get_cached_industry(job_key)
+            if cached is not None:
                 logger.info(f"Using cached industry classification for: {job.get('title')}")
-                job.update(self._industry_cache[job_key])
-                continue
-                
-            prompt = f"""Analyze this job listing and return a JSON object with sector, industry_group, industry, and industry_id fields.
-
-Job Title: {job.get('title', '')}
-Company: {job.get('company_name', '')}
-Description: {job.get('description', '')[:300]}...
-
-Return format: {{"sector": "Technology", "industry_group": "Software & IT Services", "industry": "Software", "industry_id": 501}}
-Return only valid JSON, no other text."""
+                job.update(cached)
+                return
             
+            pending = self._industry_pending.get(job_key)
+            if pending is None:
+                pending = asyncio.ensure_future(_request_classification(job, job_key))
+                self._industry_pending[job_key] = pending
+                pending.add_done_callback(lambda _: self._industry_pending.pop(job_key, None))
+            else:
+                logger.info(f"Awaiting in-flight industry classification for: {job.get('title')}")
+            classification = await pending
+            
+            # Apply classification to this job
+            job.update(classification)
+            logger.info(f"Enriched job '{job.get('title')}' with industry info: {classification.get('industry', 'Unknown')}")
+        
+        async def _request_classification(job: Dict[str, Any], job_key: Tuple[str, bytes]) -> Dict[str, Any]:
+            prompt = _INDUSTRY_PROMPT_TMPL.format_map({
+                'title': job.get('title', ''),
+                'company': job.get('company_name', ''),
+                'desc': _short_description(job)[:300]
+            })
+            
+            # Each distinct job is still classified with its own request to avoid
+            # timeouts, with at most _batch_limit requests in flight.
+            async with self._request_semaphore:
+                response_text = await self._provider.chat(prompt, timeout=15)
+            classification = self._parse_ai_response(response_text)
+            
+            # Ensure classification is a dictionary
+            if not isinstance(classification, dict):
+                logger.warning(f"Classification is not a dict for {job.get('title')}, got: {type(classification)}. Using default.")
+                raise ValueError("Classification response is not a dictionary")
+            
+            self._cache_industry(job_key, classification)
+            return classification
+        
+        async def _classify_and_notify(job: Dict[str, Any], on_classified) -> None:
             try:
-                response_text = await self._call_deepseek_api(prompt, timeout=15)
-                classification = self._parse_ai_response(response_text)
-                
-                # Ensure classification is a dictionary
-                if not isinstance(classification, dict):
-                    logger.warning(f"Classification is not a dict for {job.get('title')}, got: {type(classification)}. Using default.")
-                    raise ValueError("Classification response is not a dictionary")
-                
-                # Apply classification to this job
-                job.update(classification)
-                self._industry_cache[job_key] = classification
-                logger.info(f"Enriched job '{job.get('title')}' with industry info: {classification.get('industry', 'Unknown')}")
-                
+                await _classify_one(job)
             except Exception as e:
                 logger.error(f"Error processing industry classification for '{job.get('title')}': {e}")
                 # Add default classification for failed job
@@ -151,10 +359,13 @@ Return only valid JSON, no other text."""
                     "industry_id": 999
                 }
                 job.update(default_classification)
-                self._industry_cache[job_key] = default_classification
+                self._cache_industry(_industry_cache_key(job), default_classification)
+            
+            if on_classified is not None:
+                on_classified(job)
+        
+        await asyncio.gather(*[_classify_and_notify(job, on_classified) for job, on_classified in batch])
         
-        # Clear the batch after processing
-        self._industry_batch.clear()
         logger.info("Industry batch processing complete.")
     
     async def generate_ai_attributes(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -169,26 +380,17 @@ Return only valid JSON, no other text."""
         """
         logger.info(f"Generating AI attributes for job: {job_data.get('title')}")
         
-        prompt = f"""Based on the following job data, generate a structured JSON object containing these fields:
-- ai_title: Improved, standardized job title
-- ai_description: Clean, professional job description (2-3 sentences)
-- ai_job_tasks: Array of 3-5 key job responsibilities
-- ai_search_terms: Array of relevant search keywords
-- ai_top_tags: Array of 3-5 most important skills/technologies
-- ai_job_function_id: Numeric ID representing job function (100-999)
-- ai_skills: Array of specific skills required
-- ai_confidence_score: Float between 0.0 and 1.0 indicating parsing confidence
-
-Job Data:
-- Title: {job_data.get('title', '')}
-- Company: {job_data.get('company_name', '')}
-- Description: {job_data.get('description', '')[:1000]}...
-- Industry: {job_data.get('industry', 'N/A')}
-
-Return only valid JSON format, no other text."""
+        desc = _short_description(job_data)
+        job_data.pop(_DESC_SHORT_KEY, None)
+        prompt = _ATTRS_PROMPT_TMPL.format_map({
+            'title': job_data.get('title', ''),
+            'company': job_data.get('company_name', ''),
+            'desc': desc,
+            'industry': job_data.get('industry', 'N/A')
+        })
         
         try:
-            response_text = await self._call_deepseek_api(prompt, timeout=20)
+            response_text = await self._provider.chat(prompt, timeout=20)
             ai_data = self._parse_ai_response(response_text)
             
             # Ensure confidence score is valid
@@ -204,7 +406,7 @@ Return only valid JSON format, no other text."""
             # Add default AI attributes
             default_ai_data = {
                 "ai_title": job_data.get('title', 'Unknown Position'),
-                "ai_description": job_data.get('description', 'No description available')[:200] + "...",
+                "ai_description": (desc or 'No description available')[:200] + "...",
                 "ai_job_tasks": ["Review job posting for details"],
                 "ai_search_terms": ["general"],
                 "ai_top_tags": ["General"],
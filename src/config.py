@@ -1,45 +1,36 @@
 """
 Configuration management for the Job Data Ingestion Pipeline.
 """
-import os
-from dotenv import load_dotenv
+from typing import Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables from .env file
-load_dotenv()
 
-class Config:
-    """Application configuration."""
+class Settings(BaseSettings):
+    """Application configuration, read from the environment and .env once."""
+    
+    model_config = SettingsConfigDict(env_file='.env', extra='ignore', frozen=True)
     
     # Supabase Configuration
-    SUPABASE_URL = os.getenv('SUPABASE_URL')
-    SUPABASE_KEY = os.getenv('SUPABASE_KEY')
+    supabase_url: str
+    supabase_key: str
+    # Optional direct Postgres connection string for bulk open_jobs operations
+    supabase_db_url: Optional[str] = None
     
-    # Deepseek AI Configuration
-    DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
+    # AI Configuration
+    ai_provider: str = 'deepseek'
+    deepseek_api_key: str
+    # Upper bound on concurrent AI attribute requests during enrichment
+    ai_max_concurrency: int = Field(16, ge=1)
     
     # Xano Configuration
-    XANO_API_URL = os.getenv('XANO_API_URL')
-    XANO_API_KEY = os.getenv('XANO_API_KEY')
+    xano_api_url: str
+    xano_api_key: str
     
     # Application Configuration
-    CONFIDENCE_THRESHOLD = float(os.getenv('CONFIDENCE_THRESHOLD', '0.86'))
-    PORT = int(os.getenv('PORT', '8080'))
-    
-    # Validation
-    @classmethod
-    def validate(cls):
-        """Validate that all required environment variables are set."""
-        required_vars = [
-            'SUPABASE_URL', 'SUPABASE_KEY', 'DEEPSEEK_API_KEY',
-            'XANO_API_URL', 'XANO_API_KEY'
-        ]
-        
-        missing_vars = []
-        for var in required_vars:
-            if not getattr(cls, var):
-                missing_vars.append(var)
-        
-        if missing_vars:
-            raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
-        
-        return True
\ No newline at end of file
+    confidence_threshold: float = 0.86
+    port: int = 8080
+
+
+# Parsed once at import; raises a ValidationError listing any missing variables
+settings = Settings()
@@ -1,36 +1,144 @@
 """
 Database operations for Supabase integration.
+
+Bulk reads and writes on open_jobs go straight to Postgres through an asyncpg
+pool when SUPABASE_DB_URL is configured; otherwise they use the Supabase REST
+client from a worker thread.
 """
+import asyncio
 import logging
+import time
 from typing import Dict, Any, List, Set, Optional
+import asyncpg
+import orjson
 from supabase import create_client, Client
-from .config import Config
+from .config import settings
+from .schema import check_schema_batch, TARGET_SCHEMA
 
 logger = logging.getLogger(__name__)
 
+# Field names accepted by the open_jobs table.
+_TARGET_KEYS = frozenset(TARGET_SCHEMA)
+
+# Rows fetched per request; PostgREST caps unpaginated selects at 1000 rows.
+_PAGE_SIZE = 1000
+
+# Rows buffered per round trip when streaming from a Postgres cursor.
+_CURSOR_PREFETCH = 10000
+
+# Rows sent per bulk insert request.
+_INSERT_CHUNK_SIZE = 500
+
+# How long (in seconds) the existing job hash set is reused before re-fetching.
+_HASH_CACHE_TTL = 60
+# Hashes per asyncpg close statement, keeping the ANY($1) array bounded
+_CLOSE_CHUNK_SIZE = 1000
+# Hashes per REST close request; each hash adds ~50 bytes to the in.(...)
+# filter URL, and proxies commonly reject URLs over 8-16 KB
+_REST_CLOSE_CHUNK_SIZE = 120
+
 
 class DatabaseService:
     """Service for database operations."""
     
     def __init__(self):
         """Initialize the Supabase client."""
-        self.client: Client = create_client(Config.SUPABASE_URL, Config.SUPABASE_KEY)
+        self.client: Client = create_client(settings.supabase_url, settings.supabase_key)
+        self._pool: Optional[asyncpg.Pool] = None
+        self._existing_hashes: Optional[Set[str]] = None
+        self._existing_hashes_fetched_at = 0.0
+    
+    async def open_pool(self) -> None:
+        """Open the direct Postgres connection pool if a database URL is configured."""
+        if settings.supabase_db_url and self._pool is None:
+            self._pool = await asyncpg.create_pool(dsn=settings.supabase_db_url, min_size=2, max_size=10)
+            logger.info("Opened Postgres connection pool")
+    
+    async def close_pool(self) -> None:
+        """Close the Postgres connection pool, if open."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
     
-    def get_existing_job_hashes(self) -> Set[str]:
+    def ping(self) -> None:
+        """
+        Check database connectivity with a single-row query.
+        
+        Raises:
+            Exception: If the database cannot be reached.
+        """
+        self.client.table("open_jobs").select("id").limit(1).execute()
+    
+    def _iter_rows(self, columns: str, status: Optional[str] = None):
+        """
+        Yield rows from open_jobs one page at a time.
+        
+        Args:
+            columns: Comma-separated list of columns to select.
+            status: Optional status value to filter on.
+        """
+        start = 0
+        while True:
+            query = self.client.table("open_jobs").select(columns)
+            if status is not None:
+                query = query.eq("status", status)
+            response = query.order("id").range(start, start + _PAGE_SIZE - 1).execute()
+            rows = response.data or []
+            yield from rows
+            if len(rows) < _PAGE_SIZE:
+                return
+            start += _PAGE_SIZE
+    
+    def _rest_existing_job_hashes(self) -> Set[str]:
+        """Fetch every job hash through the REST API."""
+        existing_hashes = set()
+        for job in self._iter_rows("job_hash"):
+            if job.get('job_hash'):
+                existing_hashes.add(job['job_hash'])
+        return existing_hashes
+    
+    async def get_existing_job_hashes(self) -> Set[str]:
         """
         Get all existing job hashes from the database.
         
+        The set is cached for a short time and kept up to date with hashes
+        inserted through this service, so repeated calls do not re-scan the table.
+        
         Returns:
             Set[str]: Set of existing job hashes.
         """
+        if self._existing_hashes is not None and time.monotonic() - self._existing_hashes_fetched_at < _HASH_CACHE_TTL:
+            return self._existing_hashes
+        
         try:
-            response = self.client.table("open_jobs").select("job_hash").execute()
-            return {job['job_hash'] for job in response.data if job.get('job_hash')}
+            if self._pool is not None:
+                # Server-side cursors must run inside a transaction
+                async with self._pool.acquire() as conn, conn.transaction():
+                    existing_hashes = {
+                        record[0] async for record in conn.cursor(
+                            "SELECT job_hash FROM open_jobs WHERE job_hash IS NOT NULL",
+                            prefetch=_CURSOR_PREFETCH
+                        )
+                    }
+            else:
+                existing_hashes = await asyncio.to_thread(self._rest_existing_job_hashes)
         except Exception as e:
             logger.error(f"Error fetching existing job hashes: {e}")
             return set()
+        
+        self._existing_hashes = existing_hashes
+        self._existing_hashes_fetched_at = time.monotonic()
+        return existing_hashes
     
-    def get_active_job_hashes(self) -> Dict[str, int]:
+    def _rest_active_job_hashes(self) -> Dict[str, int]:
+        """Fetch active job hashes and IDs through the REST API."""
+        active_hashes = {}
+        for job in self._iter_rows("id,job_hash", status="ACTIVE"):
+            if job.get('job_hash'):
+                active_hashes[job['job_hash']] = job['id']
+        return active_hashes
+    
+    async def get_active_job_hashes(self) -> Dict[str, int]:
         """
         Get all active job hashes and their IDs from the database.
         
@@ -38,13 +146,83 @@ class DatabaseService:
             Dict[str, int]: Dictionary mapping job hashes to job IDs.
         """
         try:
-            response = self.client.table("open_jobs").select("id,job_hash").eq("status", "ACTIVE").execute()
-            return {job['job_hash']: job['id'] for job in response.data if job.get('job_hash')}
+            if self._pool is not None:
+                async with self._pool.acquire() as conn, conn.transaction():
+                    return {
+                        record[0]: record[1] async for record in conn.cursor(
+                            "SELECT job_hash, id FROM open_jobs WHERE status = 'ACTIVE' AND job_hash IS NOT NULL",
+                            prefetch=_CURSOR_PREFETCH
+                        )
+                    }
+            return await asyncio.to_thread(self._rest_active_job_hashes)
         except Exception as e:
             logger.error(f"Error fetching active job hashes: {e}")
             return {}
     
-    def insert_job(self, job_data: Dict[str, Any]) -> bool:
+    def _rest_active_job_hashes_set(self) -> Set[str]:
+        """Fetch active job hashes through the REST API."""
+        return {job['job_hash'] for job in self._iter_rows("job_hash", status="ACTIVE") if job.get('job_hash')}
+    
+    async def get_active_job_hashes_set(self) -> Set[str]:
+        """
+        Get all active job hashes from the database, without their IDs.
+        
+        Returns:
+            Set[str]: Set of active job hashes.
+        """
+        try:
+            if self._pool is not None:
+                async with self._pool.acquire() as conn, conn.transaction():
+                    return {
+                        record[0] async for record in conn.cursor(
+                            "SELECT job_hash FROM open_jobs WHERE status = 'ACTIVE' AND job_hash IS NOT NULL",
+                            prefetch=_CURSOR_PREFETCH
+                        )
+                    }
+            return await asyncio.to_thread(self._rest_active_job_hashes_set)
+        except Exception as e:
+            logger.error(f"Error fetching active job hashes: {e}")
+            return set()
+    
+    async def _pg_insert_rows(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Insert rows with a single statement, skipping rows that conflict.
+        
+        Returns:
+            Set[str]: Hashes of the rows that were inserted.
+        """
+        columns = [key for key in TARGET_SCHEMA if any(key in row for row in rows)]
+        column_list = ", ".join(columns)
+        query = (
+            f"INSERT INTO open_jobs ({column_list}) "
+            f"SELECT {column_list} FROM jsonb_populate_recordset(NULL::open_jobs, $1::jsonb) "
+            "ON CONFLICT DO NOTHING RETURNING job_hash"
+        )
+        async with self._pool.acquire() as conn:
+            records = await conn.fetch(query, orjson.dumps(rows).decode('utf-8'))
+        return {record[0] for record in records}
+    
+    def _rest_insert_rows(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Insert rows with a single REST request.
+        
+        Returns:
+            Set[str]: Hashes of the rows that were inserted.
+        """
+        # Rows may carry different optional fields; let omitted columns
+        # fall back to their database defaults rather than NULL.
+        response = self.client.table("open_jobs").insert(rows, default_to_null=False).execute()
+        if not response.data:
+            raise ValueError("no data returned")
+        return {row['job_hash'] for row in rows if row.get('job_hash')}
+    
+    async def _insert_rows(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """Insert rows through whichever backend is available."""
+        if self._pool is not None:
+            return await self._pg_insert_rows(rows)
+        return await asyncio.to_thread(self._rest_insert_rows, rows)
+    
+    async def insert_job(self, job_data: Dict[str, Any]) -> bool:
         """
         Insert a new job into the database.
         
@@ -55,9 +233,10 @@ class DatabaseService:
             bool: True if successful, False otherwise.
         """
         try:
-            response = self.client.table("open_jobs").insert(job_data).execute()
-            if response.data:
+            if await self._insert_rows([job_data]):
                 logger.info(f"Successfully inserted job: {job_data.get('external_job_id')}")
+                if self._existing_hashes is not None:
+                    self._existing_hashes.add(job_data['job_hash'])
                 return True
             else:
                 logger.error("Failed to insert job - no data returned")
@@ -66,7 +245,48 @@ class DatabaseService:
             logger.error(f"Error inserting job {job_data.get('external_job_id')}: {e}")
             return False
     
-    def close_jobs_by_hashes(self, job_hashes: List[str]) -> int:
+    async def insert_jobs_bulk(self, jobs: List[Dict[str, Any]], chunk: int = _INSERT_CHUNK_SIZE) -> List[int]:
+        """
+        Insert jobs into the database in chunks, one request per chunk.
+        
+        If a chunk is rejected, its rows are retried one at a time so a single
+        bad row does not drop the rest of the chunk.
+        
+        Args:
+            jobs: The job rows to insert.
+            chunk: Maximum number of rows per insert request.
+            
+        Returns:
+            List[int]: Indexes into jobs of the rows that were inserted.
+        """
+        inserted = []
+        for start in range(0, len(jobs), chunk):
+            rows = jobs[start:start + chunk]
+            try:
+                inserted_hashes = await self._insert_rows(rows)
+                logger.info(f"Successfully inserted {len(inserted_hashes)} of {len(rows)} jobs")
+            except Exception as e:
+                logger.error(f"Bulk insert of {len(rows)} jobs failed, retrying individually: {e}")
+                inserted_hashes = set()
+                for row in rows:
+                    if await self.insert_job(row):
+                        inserted_hashes.add(row['job_hash'])
+            
+            if self._existing_hashes is not None:
+                self._existing_hashes.update(inserted_hashes)
+            inserted.extend(start + i for i, row in enumerate(rows) if row.get('job_hash') in inserted_hashes)
+        
+        return inserted
+    
+    def _rest_close_jobs(self, job_hashes: List[str]) -> int:
+        """Close jobs through the REST API, returning how many were updated."""
+        response = self.client.table("open_jobs")\
+            .update({"status": "CLOSED"})\
+            .in_("job_hash", job_hashes)\
+            .execute()
+        return len(response.data) if response.data else 0
+    
+    async def close_jobs_by_hashes(self, job_hashes: List[str]) -> int:
         """
         Mark jobs as closed by their hashes.
         
@@ -80,43 +300,67 @@ class DatabaseService:
             return 0
             
         try:
-            response = self.client.table("open_jobs")\
-                .update({"status": "CLOSED"})\
-                .in_("job_hash", job_hashes)\
-                .execute()
+            closed_count = 0
+            chunk_size = _CLOSE_CHUNK_SIZE if self._pool is not None else _REST_CLOSE_CHUNK_SIZE
+            for start in range(0, len(job_hashes), chunk_size):
+                chunk = job_hashes[start:start + chunk_size]
+                if self._pool is not None:
+                    async with self._pool.acquire() as conn:
+                        status = await conn.execute(
+                            "UPDATE open_jobs SET status = 'CLOSED' WHERE job_hash = ANY($1::text[])",
+                            chunk
+                        )
+                    # asyncpg returns the command tag, e.g. "UPDATE 12"
+                    closed_count += int(status.split()[-1])
+                else:
+                    closed_count += await asyncio.to_thread(self._rest_close_jobs, chunk)
             
-            closed_count = len(response.data) if response.data else 0
             logger.info(f"Closed {closed_count} jobs")
             return closed_count
         except Exception as e:
             logger.error(f"Error closing jobs: {e}")
             return 0
     
-    def extract_and_load_job(self, job_data: Dict[str, Any], table_name: str = "open_jobs") -> bool:
+    async def extract_and_load_jobs(self, jobs_data: List[Dict[str, Any]], table_name: str = "open_jobs") -> List[Dict[str, Any]]:
         """
-        Validate job data and load it into the database.
+        Validate a batch of jobs and bulk load the valid ones into the database.
         
         Args:
-            job_data: The job data to validate and insert.
+            jobs_data: The jobs to validate and insert.
             table_name: The table name to insert into.
             
         Returns:
-            bool: True if successful, False otherwise.
+            List[Dict[str, Any]]: The jobs from jobs_data that were inserted.
         """
-        from .schema import check_schema, TARGET_SCHEMA
-        
-        logger.info(f"Processing job with external_id: {job_data.get('external_job_id', 'N/A')}")
-        
+        valid_jobs = []
+        rows = []
         # Validate the data against the schema
-        is_valid, errors = check_schema(job_data)
-        
-        if not is_valid:
-            logger.error(f"Validation FAILED. Errors: {errors}")
-            return False
+        for job_data, (is_valid, errors) in zip(jobs_data, check_schema_batch(jobs_data)):
+            
+            if not is_valid:
+                logger.error(f"Validation FAILED for job {job_data.get('external_job_id', 'N/A')}. Errors: {errors}")
+                continue
+            
+            valid_jobs.append(job_data)
+            # Extract only the fields defined in our schema
+            rows.append({key: value for key, value in job_data.items() if key in _TARGET_KEYS})
         
-        logger.info("Validation PASSED.")
+        logger.info(f"Validation PASSED for {len(valid_jobs)} of {len(jobs_data)} jobs.")
         
-        # Extract only the fields defined in our schema
-        extracted_data = {key: job_data[key] for key in TARGET_SCHEMA if key in job_data}
+        if not rows:
+            return []
+        return [valid_jobs[i] for i in await self.insert_jobs_bulk(rows)]
+    
+    async def extract_and_load_job(self, job_data: Dict[str, Any], table_name: str = "open_jobs") -> bool:
+        """
+        Validate job data and load it into the database.
         
-        return self.insert_job(extracted_data)
\ No newline at end of file
+        Args:
+            job_data: The job data to validate and insert.
+            table_name: The table name to insert into.
+            
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        logger.info(f"Processing job with external_id: {job_data.get('external_job_id', 'N/A')}")
+        return bool(await self.extract_and_load_jobs([job_data], table_name))
@@ -2,6 +2,7 @@
 File processing utilities for handling various file formats and archives.
 """
 import os
+import asyncio
 import json
 import csv
 import configparser
@@ -10,13 +11,63 @@ import zipfile
 import tarfile
 import gzip
 import shutil
+import itertools
 import urllib.parse
-import requests
-from typing import Dict, Any, Optional, List
+from concurrent.futures import Executor
+import aiofiles
+import httpx
+import orjson
+from typing import Dict, Any, Callable, Optional, List
 import logging
 
+try:
+    import rapidgzip
+except ImportError:  # Optional parallel gzip decoder; fall back to gzip
+    rapidgzip = None
+
+try:
+    import pyarrow
+    from pyarrow import csv as pyarrow_csv
+except ImportError:  # Optional vectorized CSV reader; fall back to pandas or csv
+    pyarrow = pyarrow_csv = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import ijson
+except ImportError:  # Optional streaming JSON parser for very large feeds
+    ijson = None
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # Optional faster XML parser; fall back to xml.etree
+    lxml_etree = None
+
 logger = logging.getLogger(__name__)
 
+# Buffer sizes for large archive extraction and feed downloads
+_COPY_BUFSIZE = 4 * 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+_DOWNLOAD_TIMEOUT = 60
+_CSV_BLOCK_SIZE = 4 * 1024 * 1024
+# JSON arrays larger than this are streamed item by item instead of read whole
+_JSON_STREAM_THRESHOLD = 256 * 1024 * 1024
+# Repeating element that holds one job in XML feeds
+_XML_JOB_TAG = 'job'
+
+# Concurrent parse tasks fed by archive extraction
+_PARSE_WORKERS = os.cpu_count() or 4
+
+
+def _open_gzip(file_path: str):
+    """Open a gzip file for binary reading, decoding in parallel when rapidgzip is available."""
+    if rapidgzip is not None:
+        return rapidgzip.open(file_path, parallelization=os.cpu_count())
+    return gzip.open(file_path, 'rb')
+
 
 def get_file_type(file_path: str) -> str:
     """Identifies the file type for parsing or unzipping."""
@@ -79,9 +130,65 @@ def get_parser_for_file(file_path: str) -> tuple:
     return parser, file_extension
 
 
-def unzip_file_if_needed(file_path: str, extract_to_dir: str = '.') -> Optional[str]:
+def _sendfile_range(out_fd: int, in_fd: int, offset: int, count: int) -> None:
+    """Copy count bytes starting at offset of in_fd to out_fd inside the kernel."""
+    while count > 0:
+        sent = os.sendfile(out_fd, in_fd, offset, count)
+        if sent == 0:
+            raise IOError("Unexpected end of archive data")
+        offset += sent
+        count -= sent
+
+
+def _extract_tar_members(
+    tar_ref: tarfile.TarFile,
+    extraction_path: str,
+    source_fd: Optional[int] = None,
+    on_extracted: Optional[Callable[[str], None]] = None
+) -> None:
+    """
+    Extract tar members one at a time as they are read from the archive.
+
+    When source_fd is the descriptor of an uncompressed tar file, regular
+    file payloads are copied with os.sendfile straight from their offset in
+    the archive; otherwise they are copied from the member stream.
+    on_extracted is called with the path of each file once it is written.
+    """
+    root = os.path.realpath(extraction_path)
+    for member in tar_ref:
+        target = os.path.realpath(os.path.join(root, member.name))
+        if os.path.commonpath([root, target]) != root:
+            logger.warning(f"Skipping archive member outside the extraction folder: '{member.name}'")
+            continue
+
+        if member.isreg():
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'wb') as dst:
+                if source_fd is not None and not member.issparse():
+                    _sendfile_range(dst.fileno(), source_fd, member.offset_data, member.size)
+                else:
+                    with tar_ref.extractfile(member) as src:
+                        shutil.copyfileobj(src, dst, length=_COPY_BUFSIZE)
+        elif member.isdir():
+            os.makedirs(target, exist_ok=True)
+            continue
+        else:
+            # Links and special files keep tarfile's own handling
+            tar_ref.extract(member, path=root)
+
+        if on_extracted is not None and os.path.isfile(target):
+            on_extracted(target)
+
+
+def unzip_file_if_needed(
+    file_path: str,
+    extract_to_dir: str = '.',
+    on_extracted: Optional[Callable[[str], None]] = None
+) -> Optional[str]:
     """
     Checks if a file is a compressed archive and extracts it if it is.
+    If given, on_extracted is called with the path of each extracted file
+    as soon as it is written.
     """
     if not os.path.exists(file_path):
         logger.error(f"File '{file_path}' not found.")
@@ -107,15 +214,29 @@ def unzip_file_if_needed(file_path: str, extract_to_dir: str = '.') -> Optional[
     try:
         if file_type == '.zip':
             with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(extraction_path)
-        elif file_type in ['.tar', '.tar.gz', '.tgz']:
-            with tarfile.open(file_path, 'r:*') as tar_ref:
-                tar_ref.extractall(path=extraction_path)
+                for member in zip_ref.infolist():
+                    extracted_path = zip_ref.extract(member, extraction_path)
+                    if on_extracted is not None and not member.is_dir():
+                        on_extracted(extracted_path)
+        elif file_type in ['.tar.gz', '.tgz'] and rapidgzip is not None:
+            # Stream the tar members straight out of the parallel decoder
+            with _open_gzip(file_path) as gz_ref, tarfile.open(fileobj=gz_ref, mode='r|') as tar_ref:
+                _extract_tar_members(tar_ref, extraction_path, on_extracted=on_extracted)
+        elif file_type in ['.tar.gz', '.tgz']:
+            with tarfile.open(file_path, 'r|*') as tar_ref:
+                _extract_tar_members(tar_ref, extraction_path, on_extracted=on_extracted)
+        elif file_type == '.tar':
+            # Uncompressed and seekable: read headers only and sendfile each payload
+            with open(file_path, 'rb') as raw_ref, tarfile.open(fileobj=raw_ref, mode='r:') as tar_ref:
+                source_fd = raw_ref.fileno() if hasattr(os, 'sendfile') else None
+                _extract_tar_members(tar_ref, extraction_path, source_fd, on_extracted)
         elif file_type == '.gz':
             output_filename = os.path.join(extraction_path, os.path.splitext(file_name)[0])
-            with gzip.open(file_path, 'rb') as f_in:
+            with _open_gzip(file_path) as f_in:
                 with open(output_filename, 'wb') as f_out:
-                    shutil.copyfileobj(f_in, f_out)
+                    shutil.copyfileobj(f_in, f_out, length=_COPY_BUFSIZE)
+            if on_extracted is not None:
+                on_extracted(output_filename)
 
         logger.info(f"Successfully extracted to '{extraction_path}'")
         return extraction_path
@@ -124,6 +245,138 @@ def unzip_file_if_needed(file_path: str, extract_to_dir: str = '.') -> Optional[
         return None
 
 
+def _read_csv_rows(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Reads a CSV file into a list of row dicts with every value kept as a string,
+    using pyarrow or pandas when installed and csv.DictReader otherwise.
+
+    Files with ragged rows, which pyarrow and pandas reject, are read with
+    csv.DictReader so short rows are padded with None as before.
+    """
+    if pyarrow_csv is not None:
+        with open(file_path, mode='r', encoding='utf-8', newline='') as csv_file:
+            header = next(csv.reader(csv_file), None)
+        if not header:
+            return []
+        try:
+            table = pyarrow_csv.read_csv(
+                file_path,
+                read_options=pyarrow_csv.ReadOptions(block_size=_CSV_BLOCK_SIZE),
+                parse_options=pyarrow_csv.ParseOptions(newlines_in_values=True),
+                convert_options=pyarrow_csv.ConvertOptions(
+                    column_types={name: pyarrow.string() for name in header},
+                    strings_can_be_null=False
+                )
+            )
+            return table.to_pylist()
+        except pyarrow.ArrowInvalid as e:
+            logger.warning(f"pyarrow could not read '{file_path}' ({e}); falling back to csv.DictReader")
+            return _read_csv_rows_dictreader(file_path)
+
+    if pandas is not None:
+        try:
+            return pandas.read_csv(file_path, engine='c', dtype=str, keep_default_na=False).to_dict('records')
+        except pandas.errors.ParserError as e:
+            logger.warning(f"pandas could not read '{file_path}' ({e}); falling back to csv.DictReader")
+            return _read_csv_rows_dictreader(file_path)
+
+    return _read_csv_rows_dictreader(file_path)
+
+
+def _read_csv_rows_dictreader(file_path: str) -> List[Dict[str, Any]]:
+    """Reads a CSV file into a list of row dicts with csv.DictReader."""
+    with open(file_path, mode='r', encoding='utf-8') as csv_file:
+        reader = csv.DictReader(csv_file)
+        return [row for row in reader]
+
+
+def _read_json(file_path: str) -> Any:
+    """
+    Reads a JSON file with orjson. Very large top-level arrays are streamed
+    with ijson when it is installed, so the raw file is never held in memory.
+    """
+    with open(file_path, 'rb') as f:
+        if ijson is not None and os.path.getsize(file_path) > _JSON_STREAM_THRESHOLD:
+            head = f.read(64).lstrip()
+            f.seek(0)
+            if head.startswith(b'['):
+                return list(ijson.items(f, 'item', use_float=True))
+
+        data = f.read()
+
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # json accepts a few extensions orjson rejects (NaN, Infinity, huge ints)
+        return json.loads(data)
+
+
+def _element_to_dict(element) -> Dict[str, Any]:
+    """
+    Converts an XML element's children into a nested dictionary.
+
+    Walks the tree with an explicit stack instead of recursion: each child
+    with children of its own gets an empty dict up front, which is filled
+    in place when the child is popped.
+    """
+    root_node = {}
+    stack = [(element, root_node)]
+    while stack:
+        elem, node = stack.pop()
+        for child in elem:
+            if len(child):
+                value = {}
+                stack.append((child, value))
+            else:
+                value = child.text
+
+            tag = child.tag
+            if tag not in node:
+                node[tag] = value
+            else:
+                # Handle multiple elements with the same tag
+                existing = node[tag]
+                if isinstance(existing, list):
+                    existing.append(value)
+                else:
+                    node[tag] = [existing, value]
+    return root_node
+
+
+def _iter_xml_jobs(file_path: str):
+    """
+    Yields each <job> element of an XML feed as a dictionary, discarding
+    elements once converted so the whole document is never held in memory.
+    """
+    if lxml_etree is not None:
+        for _, elem in lxml_etree.iterparse(
+            file_path, tag=_XML_JOB_TAG, remove_comments=True, remove_pis=True
+        ):
+            yield _element_to_dict(elem) if len(elem) > 0 else elem.text
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    else:
+        for _, elem in ET.iterparse(file_path):
+            if elem.tag == _XML_JOB_TAG:
+                yield _element_to_dict(elem) if len(elem) > 0 else elem.text
+                elem.clear()
+
+
+def _read_xml(file_path: str) -> Dict[str, Any]:
+    """
+    Reads an XML file. Job feeds are streamed one <job> at a time into
+    {'jobs': {'job': [...]}}; other documents are converted whole.
+    """
+    jobs = list(_iter_xml_jobs(file_path))
+    if jobs:
+        return {'jobs': {'job': jobs}}
+
+    tree = ET.parse(file_path)
+    root = tree.getroot()
+    return {root.tag: _element_to_dict(root)}
+
+
 def parse_file_to_json(file_path: str) -> Optional[Dict[str, Any]]:
     """
     Parses a single file (CSV, INI, XML, JSON) and returns its content as a Python dictionary.
@@ -135,9 +388,7 @@ def parse_file_to_json(file_path: str) -> Optional[Dict[str, Any]]:
 
     try:
         if file_type == '.csv':
-            with open(file_path, mode='r', encoding='utf-8') as csv_file:
-                reader = csv.DictReader(csv_file)
-                return [row for row in reader]
+            return _read_csv_rows(file_path)
 
         elif file_type == '.ini':
             config = configparser.ConfigParser()
@@ -145,25 +396,10 @@ def parse_file_to_json(file_path: str) -> Optional[Dict[str, Any]]:
             return {section: dict(config.items(section)) for section in config.sections()}
 
         elif file_type == '.xml':
-            def element_to_dict(element):
-                node = {}
-                for child in element:
-                    if child.tag not in node:
-                        node[child.tag] = element_to_dict(child) if len(child) > 0 else child.text
-                    else:
-                        # Handle multiple elements with the same tag
-                        if not isinstance(node[child.tag], list):
-                            node[child.tag] = [node[child.tag]]
-                        node[child.tag].append(element_to_dict(child) if len(child) > 0 else child.text)
-                return node
-
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            return {root.tag: element_to_dict(root)}
+            return _read_xml(file_path)
 
         elif file_type == '.json':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return _read_json(file_path)
 
         else:
             logger.warning(f"Unsupported file type for parsing: {file_type}")
@@ -174,61 +410,90 @@ def parse_file_to_json(file_path: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def process_input(input_path: str, extract_to_dir: str = './temp') -> Dict[str, Any]:
+async def download_file(url: str, extract_to_dir: str) -> str:
+    """
+    Downloads a URL into extract_to_dir without blocking the event loop
+    and returns the local file path.
+    """
+    parsed_url = urllib.parse.urlparse(url)
+    path = parsed_url.path
+    filename = os.path.basename(path) or 'downloaded_file'
+    downloaded_file_path = os.path.join(extract_to_dir, filename)
+
+    logger.info(f"Downloading '{filename}'...")
+    try:
+        async with httpx.AsyncClient(follow_redirects=True, timeout=_DOWNLOAD_TIMEOUT) as client:
+            async with client.stream('GET', url) as response:
+                response.raise_for_status()
+
+                async with aiofiles.open(downloaded_file_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
+        logger.info(f"Successfully downloaded and saved as '{downloaded_file_path}'")
+        return downloaded_file_path
+
+    except httpx.HTTPError as e:
+        logger.error(f"Could not download the file. {e}")
+        raise
+
+
+async def parse_local_input(file_path: str, extract_to_dir: str, executor: Optional[Executor] = None) -> Dict[str, Any]:
+    """
+    Extracts a local file if it is an archive and returns parsed data
+    from all files found.
+
+    Extraction runs in a thread and hands each file to a pool of parse
+    tasks as soon as it is written, so parsing overlaps extraction. Parsing
+    runs on executor (the loop's default executor when None).
+    """
+    if not (file_path and os.path.exists(file_path)):
+        return {}
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    # Parsed data by arrival order, so results keep extraction order
+    parsed_by_index = {}
+    arrivals = itertools.count()
+
+    def _on_extracted(path: str) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, (next(arrivals), path))
+
+    async def _parse_worker() -> None:
+        while (item := await queue.get()) is not None:
+            index, path = item
+            parsed_data = await loop.run_in_executor(executor, parse_file_to_json, path)
+            if parsed_data:
+                parsed_by_index[index] = (os.path.basename(path), parsed_data)
+
+    workers = [asyncio.create_task(_parse_worker()) for _ in range(_PARSE_WORKERS)]
+    try:
+        extraction_path = await asyncio.to_thread(unzip_file_if_needed, file_path, extract_to_dir, _on_extracted)
+        if not extraction_path:
+            # Parse the file directly
+            queue.put_nowait((next(arrivals), file_path))
+    finally:
+        for _ in workers:
+            queue.put_nowait(None)
+        await asyncio.gather(*workers)
+
+    return dict(parsed_by_index[index] for index in sorted(parsed_by_index))
+
+
+async def process_input(input_path: str, extract_to_dir: str = './temp', executor: Optional[Executor] = None) -> Dict[str, Any]:
     """
     Processes the input, whether it's a local file path or a URL,
     and returns parsed data from all files found.
     """
-    downloaded_file_path = None
-    all_parsed_data = {}
-
     # Ensure extract directory exists
     os.makedirs(extract_to_dir, exist_ok=True)
 
     # Check if the input is a URL
     if input_path.startswith('http://') or input_path.startswith('https://'):
         logger.info(f"URL detected: {input_path}")
-        parsed_url = urllib.parse.urlparse(input_path)
-        path = parsed_url.path
-        filename = os.path.basename(path) or 'downloaded_file'
-        downloaded_file_path = os.path.join(extract_to_dir, filename)
-
-        # Download the file
-        logger.info(f"Downloading '{filename}'...")
-        try:
-            response = requests.get(input_path, stream=True)
-            response.raise_for_status()
-
-            with open(downloaded_file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            logger.info(f"Successfully downloaded and saved as '{downloaded_file_path}'")
-
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Could not download the file. {e}")
-            raise
+        downloaded_file_path = await download_file(input_path, extract_to_dir)
     else:
         # Treat as a local file path
         logger.info(f"Local file path detected: {input_path}")
         downloaded_file_path = input_path
 
-    # Process the file (extract if needed, then parse)
-    if downloaded_file_path and os.path.exists(downloaded_file_path):
-        extraction_path = unzip_file_if_needed(downloaded_file_path, extract_to_dir)
-
-        if extraction_path:
-            # Parse files inside the extracted archive
-            for root, _, files in os.walk(extraction_path):
-                for name in files:
-                    file_to_parse = os.path.join(root, name)
-                    parsed_data = parse_file_to_json(file_to_parse)
-                    if parsed_data:
-                        all_parsed_data[name] = parsed_data
-        else:
-            # Parse the file directly
-            parsed_data = parse_file_to_json(downloaded_file_path)
-            if parsed_data:
-                filename = os.path.basename(downloaded_file_path)
-                all_parsed_data[filename] = parsed_data
-
-    return all_parsed_data
\ No newline at end of file
+    return await parse_local_input(downloaded_file_path, extract_to_dir, executor)
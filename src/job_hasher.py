@@ -4,7 +4,59 @@ Job hashing utilities for deduplication.
 import json
 import base64
 import hashlib
-from typing import Dict, Any
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Any, Iterable, List
+
+# The core fields that truly determine the uniqueness of a job,
+# independent of its location or source-specific IDs.
+_UNIQUENESS_FIELDS = (
+    'company_name',
+    'title',
+    'description',
+    'employment_type',
+)
+
+# Built once so each hash skips json.dumps' per-call encoder construction.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(',', ':'))
+
+# The canonical object with its keys already in sorted order, so building it
+# needs neither a dict nor a sort.
+_CANONICAL_FIELDS = tuple(sorted(_UNIQUENESS_FIELDS))
+_CANONICAL_TEMPLATE = '{' + ','.join('"%s":%%s' % key for key in _CANONICAL_FIELDS) + '}'
+
+
+def _encode_value(value: Any) -> str:
+    """Encode one field value exactly as json.dumps would."""
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    return _CANONICAL_ENCODER.encode(value)
+
+
+def _canonical_string(job_data: Dict[str, Any]) -> str:
+    """Build the sorted, compact JSON of a job's uniqueness fields."""
+    return _CANONICAL_TEMPLATE % tuple([_encode_value(job_data.get(key)) for key in _CANONICAL_FIELDS])
+
+
+def hash_jobs_bulk(jobs: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    Compute canonical job hashes for many jobs in one pass.
+
+    Produces exactly the same values as get_canonical_job_hash, with the
+    hash constructor and Base64 encoder looked up once per batch.
+
+    Args:
+        jobs: The job data dictionaries.
+
+    Returns:
+        List[str]: Base64 encoded SHA256 hashes, in the same order as jobs.
+    """
+    sha256 = hashlib.sha256
+    b64encode = base64.b64encode
+
+    return [
+        b64encode(sha256(_canonical_string(job_data).encode('utf-8')).digest()).decode('ascii')
+        for job_data in jobs
+    ]
 
 
 def get_canonical_job_hash(job_data: Dict[str, Any]) -> str:
@@ -21,25 +73,4 @@ def get_canonical_job_hash(job_data: Dict[str, Any]) -> str:
     Returns:
         str: A unique Base64 encoded SHA256 hash representing the job's core content.
     """
-    # Define the core fields that truly determine the uniqueness of a job,
-    # independent of its location or source-specific IDs.
-    uniqueness_fields = [
-        'company_name',
-        'title',
-        'description',
-        'employment_type',
-    ]
-
-    # Create a dictionary with only the core fields.
-    canonical_dict = {key: job_data.get(key) for key in uniqueness_fields}
-
-    # Create a stable, sorted JSON string.
-    canonical_string = json.dumps(canonical_dict, sort_keys=True, separators=(',', ':'))
-
-    # Hash the string using SHA256 for a secure, fixed-length output.
-    hash_object = hashlib.sha256(canonical_string.encode('utf-8'))
-
-    # Encode the binary hash in Base64 for easy storage and comparison.
-    base64_hash = base64.b64encode(hash_object.digest()).decode('utf-8')
-
-    return base64_hash
\ No newline at end of file
+    return hash_jobs_bulk((job_data,))[0]
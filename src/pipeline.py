@@ -3,14 +3,17 @@ Main ETL pipeline orchestration.
 """
 import asyncio
 import logging
+import multiprocessing
 import tempfile
 import shutil
-from datetime import datetime
-from typing import Dict, Any, List, Set
-from .config import Config
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, FrozenSet, List, Set, Tuple
+from .config import settings
 from .file_processor import process_input
-from .schema import transform_job_data, FEED_SCHEMA_MAPPING
-from .job_hasher import get_canonical_job_hash
+from .schema import transform_feed_job
+from .job_hasher import hash_jobs_bulk
 from .database import DatabaseService
 from .ai_service import AIService
 from .xano_service import XanoService
@@ -18,6 +21,9 @@ from .review_queue import ReviewQueue
 
 logger = logging.getLogger(__name__)
 
+# Low-cardinality feed fields; interning shares one string object across jobs
+INTERNED_JOB_FIELDS = ('company_name', 'employment_type', 'salary_period', 'currency')
+
 
 class JobPipeline:
     """Main ETL pipeline for job data processing."""
@@ -28,7 +34,24 @@ class JobPipeline:
         self.ai_service = AIService()
         self.xano_service = XanoService()
         self.review_queue = ReviewQueue()
-        self.confidence_threshold = Config.CONFIDENCE_THRESHOLD
+        self.confidence_threshold = settings.confidence_threshold
+        # Worker processes for CPU-bound feed file parsing, created by start()
+        self._parse_executor = None
+    
+    async def start(self) -> None:
+        """Open connection pools used by the pipeline's services."""
+        await self.db_service.open_pool()
+        # forkserver: forking this threaded process could copy a held lock
+        # (e.g. logging's) into a worker and deadlock it
+        self._parse_executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context('forkserver'))
+    
+    async def aclose(self) -> None:
+        """Release network resources held by the pipeline's services."""
+        await self.ai_service.aclose()
+        await self.db_service.close_pool()
+        if self._parse_executor is not None:
+            self._parse_executor.shutdown(cancel_futures=True)
+            self._parse_executor = None
     
     def check_confidence_and_route(self, job: Dict[str, Any]) -> bool:
         """
@@ -56,84 +79,125 @@ class JobPipeline:
             logger.info(f"Confidence {confidence_score} < {self.confidence_threshold}. Sending for manual review.")
             return self.review_queue.send_for_manual_review(job)
     
-    def check_and_close_jobs(self, new_feed_jobs: List[Dict[str, Any]]) -> int:
+    def partition_by_confidence(
+        self,
+        jobs: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
         """
-        Compare new job feed against database to identify and close inactive jobs.
+        Split enriched jobs into auto-approved and manual-review lists.
+        
+        Jobs without a numeric confidence score go to manual review.
         
         Args:
-            new_feed_jobs: List of job dictionaries from the new feed.
+            jobs: The enriched job data dictionaries.
             
         Returns:
-            int: Number of jobs closed.
+            Tuple of the auto-approved jobs and the jobs needing manual review.
         """
-        logger.info("Starting job closure check")
-        
-        # Get all job hashes from the new feed
-        hashes_in_new_feed = {get_canonical_job_hash(job) for job in new_feed_jobs}
-        logger.info(f"Found {len(hashes_in_new_feed)} unique job hashes in the new feed")
+        auto_approved = []
+        manual_review = []
+        for job in jobs:
+            confidence_score = job.get('ai_confidence_score')
+            if isinstance(confidence_score, (int, float)) and confidence_score >= self.confidence_threshold:
+                auto_approved.append(job)
+            else:
+                manual_review.append(job)
         
-        # Get all active job hashes currently in the database
-        active_jobs_in_db = self.db_service.get_active_job_hashes()
-        logger.info(f"Found {len(active_jobs_in_db)} active job hashes in the database")
+        logger.info(f"{len(auto_approved)} jobs at or above confidence {self.confidence_threshold}; {len(manual_review)} for manual review")
+        return auto_approved, manual_review
+    
+    def _ingest_pass(
+        self,
+        new_jobs: List[Dict[str, Any]],
+        existing_hashes: Set[str]
+    ) -> Tuple[List[Dict[str, Any]], FrozenSet[str]]:
+        """
+        Hash, deduplicate and prepare a feed's jobs for insertion in one loop.
         
-        # Find hashes that are in DB but not in new feed
-        hashes_to_close = set(active_jobs_in_db.keys()) - hashes_in_new_feed
+        Args:
+            new_jobs: List of job dictionaries from the new feed.
+            existing_hashes: Hashes of every job already in the database.
+            
+        Returns:
+            Tuple of the rows to insert and the set of all hashes in the feed.
+        """
+        # One ingest timestamp for every job in this run
+        now_iso = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        # Default boolean values, used only where the job does not set them
+        job_defaults = {
+            'is_remote': False,
+            'is_multi_location': False,
+            'is_international': False
+        }
+        # Metadata stamped on every inserted job
+        job_metadata = {
+            'job_source': 'JOB_FEED',
+            'feed_id': 1,  # Could be parameterized
+            'status': 'ACTIVE',
+            'created_at': now_iso,
+            'updated_at': now_iso
+        }
         
-        if not hashes_to_close:
-            logger.info("No jobs to close. All active jobs in DB are present in the new feed.")
-            return 0
+        jobs_to_insert = []
+        hashes_in_new_feed = set()
+        duplicates = 0
+        for job, job_hash in zip(new_jobs, hash_jobs_bulk(new_jobs)):
+            job['job_hash'] = job_hash
+            
+            is_duplicate = job_hash in existing_hashes or job_hash in hashes_in_new_feed
+            hashes_in_new_feed.add(job_hash)
+            
+            # Duplicates dominate incremental feeds; skip them before any
+            # per-job formatting and report them as one count below
+            if is_duplicate:
+                duplicates += 1
+                continue
+            
+            logger.info(f"Processing job '{job.get('title', 'N/A')}' | Hash: {job_hash[:10]}...")
+            logger.info("Result: UNIQUE. Queued for insertion.")
+            
+            # Add defaults and metadata in one merge (job_hash is already stamped on the job)
+            jobs_to_insert.append({**job_defaults, **job, **job_metadata})
         
-        logger.info(f"Found {len(hashes_to_close)} jobs to mark as CLOSED")
-        return self.db_service.close_jobs_by_hashes(list(hashes_to_close))
+        logger.info(f"Found {len(hashes_in_new_feed)} unique job hashes in the new feed")
+        logger.info(f"Result: DUPLICATE for {duplicates} jobs already in the database or feed. Skipped.")
+        return jobs_to_insert, frozenset(hashes_in_new_feed)
     
-    def process_and_insert_jobs(self, new_jobs: List[Dict[str, Any]]) -> int:
+    async def ingest_jobs(self, new_jobs: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
         """
-        Process a list of new jobs, check for duplicates, and insert unique ones.
+        Close jobs missing from the feed and insert its new unique jobs.
         
         Args:
-            new_jobs: List of new job dictionaries to process.
+            new_jobs: List of job dictionaries from the new feed.
             
         Returns:
-            int: Number of new jobs inserted.
+            Tuple of the number of jobs closed and the rows actually inserted.
         """
-        logger.info("Starting duplicate job check and insertion")
+        logger.info("Starting job closure check, duplicate check and insertion")
         
-        # Get all existing job hashes from database
-        existing_hashes = self.db_service.get_existing_job_hashes()
+        # Get all existing and active job hashes from the database
+        existing_hashes, active_hashes_in_db = await asyncio.gather(
+            self.db_service.get_existing_job_hashes(),
+            self.db_service.get_active_job_hashes_set()
+        )
         logger.info(f"Found {len(existing_hashes)} existing job hashes in the database")
+        logger.info(f"Found {len(active_hashes_in_db)} active job hashes in the database")
         
-        new_jobs_inserted = 0
-        for job in new_jobs:
-            job_hash = get_canonical_job_hash(job)
-            job_title = job.get('title', 'N/A')
-            
-            logger.info(f"Processing job '{job_title}' | Hash: {job_hash[:10]}...")
-            
-            if job_hash in existing_hashes:
-                logger.info("Result: DUPLICATE. Job already exists in database. Skipping.")
-            else:
-                logger.info("Result: UNIQUE. Inserting new job.")
-                
-                # Add hash to job data and metadata
-                job_to_insert = job.copy()
-                job_to_insert['job_hash'] = job_hash
-                job_to_insert['job_source'] = 'JOB_FEED'
-                job_to_insert['feed_id'] = 1  # Could be parameterized
-                job_to_insert['status'] = 'ACTIVE'
-                job_to_insert['created_at'] = datetime.utcnow().isoformat() + 'Z'
-                job_to_insert['updated_at'] = datetime.utcnow().isoformat() + 'Z'
-                
-                # Set default boolean values if not present
-                job_to_insert.setdefault('is_remote', False)
-                job_to_insert.setdefault('is_multi_location', False)
-                job_to_insert.setdefault('is_international', False)
-                
-                if self.db_service.extract_and_load_job(job_to_insert):
-                    existing_hashes.add(job_hash)
-                    new_jobs_inserted += 1
+        jobs_to_insert, hashes_in_new_feed = self._ingest_pass(new_jobs, existing_hashes)
+        
+        # Find hashes that are in DB but not in new feed
+        hashes_to_close = active_hashes_in_db - hashes_in_new_feed
+        if hashes_to_close:
+            logger.info(f"Found {len(hashes_to_close)} jobs to mark as CLOSED")
+            jobs_closed = await self.db_service.close_jobs_by_hashes(list(hashes_to_close))
+        else:
+            logger.info("No jobs to close. All active jobs in DB are present in the new feed.")
+            jobs_closed = 0
         
-        logger.info(f"Process complete. Inserted {new_jobs_inserted} new jobs.")
-        return new_jobs_inserted
+        inserted_jobs = await self.db_service.extract_and_load_jobs(jobs_to_insert) if jobs_to_insert else []
+        
+        logger.info(f"Process complete. Inserted {len(inserted_jobs)} new jobs.")
+        return jobs_closed, inserted_jobs
     
     async def enrich_jobs_with_ai(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -147,24 +211,43 @@ class JobPipeline:
         """
         logger.info(f"Starting AI enrichment for {len(jobs)} jobs")
         
-        # Step 1: Classify industries in batch
-        for job in jobs:
-            self.ai_service.add_job_for_industry_classification(job)
+        # Jobs flow from industry classification straight into a pool of
+        # workers generating AI attributes, so the two stages overlap.
+        queue = asyncio.Queue()
+        enriched_jobs = []
+        workers = [
+            asyncio.create_task(self._enrichment_worker(queue, enriched_jobs))
+            for _ in range(min(settings.ai_max_concurrency, len(jobs)))
+        ]
         
-        await self.ai_service.process_industry_batch()
+        try:
+            # Step 1: Classify industries in batch
+            for job in jobs:
+                cached_classification = self.ai_service.add_job_for_industry_classification(
+                    job, on_classified=queue.put_nowait
+                )
+                if cached_classification is not None:
+                    job.update(cached_classification)
+                    queue.put_nowait(job)
+            
+            await self.ai_service.flush()
+        finally:
+            # Step 2: Let the workers drain the queue, then stop
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
         
-        # Step 2: Generate AI attributes for each job
-        enriched_jobs = []
-        for job in jobs:
+        logger.info(f"AI enrichment complete for {len(enriched_jobs)} jobs")
+        return enriched_jobs
+    
+    async def _enrichment_worker(self, queue: asyncio.Queue, enriched_jobs: List[Dict[str, Any]]) -> None:
+        """Generate AI attributes for jobs taken from queue until a None sentinel arrives."""
+        while (job := await queue.get()) is not None:
             try:
-                enriched_job = await self.ai_service.generate_ai_attributes(job)
-                enriched_jobs.append(enriched_job)
+                enriched_jobs.append(await self.ai_service.generate_ai_attributes(job))
             except Exception as e:
                 logger.error(f"Error enriching job {job.get('title', 'Unknown')}: {e}")
                 enriched_jobs.append(job)  # Add without enrichment
-        
-        logger.info(f"AI enrichment complete for {len(enriched_jobs)} jobs")
-        return enriched_jobs
     
     async def process_feed(self, input_path: str) -> Dict[str, Any]:
         """
@@ -194,7 +277,7 @@ class JobPipeline:
                 
                 # Step 1: Process input (download, extract, parse)
                 logger.info("Step 1: Processing input files")
-                parsed_data = process_input(input_path, temp_dir)
+                parsed_data = await process_input(input_path, temp_dir, self._parse_executor)
                 
                 if not parsed_data:
                     results["errors"].append("No data could be parsed from input")
@@ -232,8 +315,12 @@ class JobPipeline:
                     # Transform each job
                     for job_item in jobs_to_process:
                         if isinstance(job_item, dict):
-                            transformed_job = transform_job_data(job_item, FEED_SCHEMA_MAPPING)
+                            transformed_job = transform_feed_job(job_item)
                             if transformed_job and any(key in transformed_job for key in ['title', 'company_name', 'external_job_id']):
+                                for field in INTERNED_JOB_FIELDS:
+                                    value = transformed_job.get(field)
+                                    if type(value) is str:
+                                        transformed_job[field] = sys.intern(value)
                                 all_jobs.append(transformed_job)
                 
                 results["jobs_processed"] = len(all_jobs)
@@ -243,32 +330,28 @@ class JobPipeline:
                     results["errors"].append("No valid jobs found after transformation")
                     return results
                 
-                # Step 3: Check for closed jobs
-                logger.info("Step 3: Checking for jobs to close")
-                results["jobs_closed"] = self.check_and_close_jobs(all_jobs)
-                
-                # Step 4: Insert new unique jobs
-                logger.info("Step 4: Inserting unique jobs")
-                results["jobs_inserted"] = self.process_and_insert_jobs(all_jobs)
+                # Steps 3-4: Close jobs missing from the feed and insert new unique jobs
+                logger.info("Steps 3-4: Closing missing jobs and inserting unique jobs")
+                results["jobs_closed"], inserted_jobs = await self.ingest_jobs(all_jobs)
+                results["jobs_inserted"] = len(inserted_jobs)
                 
-                # Step 5: AI enrichment for new jobs
-                if results["jobs_inserted"] > 0:
+                # Step 5: AI enrichment for the jobs that were actually inserted
+                if inserted_jobs:
                     logger.info("Step 5: AI enrichment")
-                    enriched_jobs = await self.enrich_jobs_with_ai(all_jobs[:results["jobs_inserted"]])
+                    enriched_jobs = await self.enrich_jobs_with_ai(inserted_jobs)
                     
                     # Step 6: Route based on confidence
                     logger.info("Step 6: Confidence-based routing")
-                    for job in enriched_jobs:
-                        try:
-                            confidence = job.get('ai_confidence_score', 0)
-                            if self.check_confidence_and_route(job):
-                                if confidence >= self.confidence_threshold:
-                                    results["jobs_auto_approved"] += 1
-                                else:
-                                    results["jobs_manual_review"] += 1
-                        except Exception as e:
-                            logger.error(f"Error routing job {job.get('title', 'Unknown')}: {e}")
-                            results["errors"].append(f"Routing error: {str(e)}")
+                    try:
+                        auto_approved, manual_review = self.partition_by_confidence(enriched_jobs)
+                        synced, results["jobs_manual_review"] = await asyncio.gather(
+                            asyncio.to_thread(self.xano_service.sync_to_xano_bulk, auto_approved),
+                            asyncio.to_thread(self.review_queue.send_batch, manual_review)
+                        )
+                        results["jobs_auto_approved"] = sum(synced)
+                    except Exception as e:
+                        logger.error(f"Error routing jobs: {e}")
+                        results["errors"].append(f"Routing error: {str(e)}")
                 
                 results["success"] = True
                 logger.info("Pipeline processing completed successfully")
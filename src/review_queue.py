@@ -74,6 +74,44 @@ class ReviewQueue:
             logger.error(f"Error adding job to review queue: {e}")
             return False
     
+    def send_batch(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        Add many jobs to the manual review queue with one load and one save.
+        
+        Args:
+            jobs: The job data to be reviewed.
+            
+        Returns:
+            int: Number of jobs added.
+        """
+        if not jobs:
+            return 0
+        
+        logger.info(f"Sending {len(jobs)} jobs for manual review")
+        
+        try:
+            review_queue = self.load_review_queue()
+            
+            # Add metadata for the review process
+            added_at = datetime.utcnow().isoformat() + 'Z'
+            review_queue.extend(
+                {
+                    "review_status": "pending",
+                    "added_to_queue_at": added_at,
+                    "job_data": job_data
+                }
+                for job_data in jobs
+            )
+            
+            self.save_review_queue(review_queue)
+            
+            logger.info(f"{len(jobs)} jobs successfully added to '{self.queue_file}'. Total jobs in queue: {len(review_queue)}")
+            return len(jobs)
+            
+        except Exception as e:
+            logger.error(f"Error adding jobs to review queue: {e}")
+            return 0
+    
     def get_queue_status(self) -> Dict[str, Any]:
         """Get the current status of the review queue."""
         try:
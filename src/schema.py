@@ -1,8 +1,11 @@
 """
 Schema definitions and validation for job data.
 """
+import math
 from datetime import datetime
-from typing import Dict, Any, Tuple, List
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, Callable, Mapping, Tuple, List
 
 TARGET_SCHEMA = {
     "external_job_id": {"type": str, "required": True},
@@ -29,7 +32,8 @@ TARGET_SCHEMA = {
     "currency": {"type": str, "required": False, "nullable": True},
 }
 
-FEED_SCHEMA_MAPPING = {
+# Read-only, so the transform compiled from it below can never go stale
+FEED_SCHEMA_MAPPING = MappingProxyType({
     # Company Name Mappings
     'company': 'company_name',
     'company_name': 'company_name',
@@ -121,11 +125,61 @@ FEED_SCHEMA_MAPPING = {
     'pay_period': 'salary_period',
     'currency': 'currency',
     'salary_currency': 'currency',
+})
+
+
+# Validation plan derived once from TARGET_SCHEMA: the required field names,
+# and per field a (type, exact type, nullable, allowed_values) tuple.
+_REQUIRED_FIELDS = tuple(field for field, rules in TARGET_SCHEMA.items() if rules.get("required"))
+_REQUIRED_FIELD_SET = frozenset(_REQUIRED_FIELDS)
+_DATETIME_FIELDS = frozenset(field for field, rules in TARGET_SCHEMA.items() if rules["type"] == "datetime")
+
+# Order used by check_schema(fast_fail=True): fields feeds most often get
+# wrong come first, so invalid jobs are rejected after as few checks as possible
+_LIKELY_FAILURES = ('posted_at', 'description', 'title', 'company_name', 'external_job_id', 'salary_min', 'salary_max', 'expires_at')
+_FIELD_CHECK_ORDER = _LIKELY_FAILURES + tuple(field for field in TARGET_SCHEMA if field not in _LIKELY_FAILURES)
+_REQUIRED_CHECK_ORDER = tuple(field for field in _FIELD_CHECK_ORDER if field in _REQUIRED_FIELD_SET)
+_FIELD_RULES = {
+    field: (
+        rules["type"],
+        # Exact type tried with an identity compare before isinstance; for
+        # tuple types such as salaries this skips isinstance's tuple scan
+        rules["type"][0] if isinstance(rules["type"], tuple) else rules["type"],
+        bool(rules.get("nullable")),
+        rules.get("allowed_values")
+    )
+    for field, rules in TARGET_SCHEMA.items()
 }
 
+# Error messages formatted once per field; only the offending value is
+# filled in when a job fails
+_MISSING_MESSAGES = {field: f"Missing required field: '{field}'" for field in TARGET_SCHEMA}
+_NULL_MESSAGES = {field: f"Field '{field}' cannot be null." for field in TARGET_SCHEMA}
+_DATETIME_MESSAGES = {field: f"Field '{field}' is not a valid ISO datetime string. Got: " for field in _DATETIME_FIELDS}
+_TYPE_MESSAGES = {field: f"Field '{field}' has incorrect type. Expected {rules[0]}, got " for field, rules in _FIELD_RULES.items()}
+_ALLOWED_MESSAGES = {
+    field: (f"Field '{field}' has value '", f"', but only {rules[3]} are allowed.")
+    for field, rules in _FIELD_RULES.items() if rules[3] is not None
+}
 
-def validate_datetime_string(dt_string: str) -> bool:
-    """Checks if a string is a valid ISO 8601 format."""
+
+@lru_cache(maxsize=8192)
+def _is_iso_datetime(dt_string: str) -> bool:
+    """
+    Parses an ISO 8601 string, memoized per process.
+
+    Parsing is deterministic, and feeds repeat the same timestamps heavily
+    (created_at == updated_at, many jobs posted on the same day).
+    """
+    # fromisoformat accepts a trailing 'Z' natively on Python 3.11+, so try
+    # the string as-is before paying for the replacement copy
+    try:
+        datetime.fromisoformat(dt_string)
+        return True
+    except (ValueError, TypeError):
+        pass
+    if 'Z' not in dt_string:
+        return False
     try:
         datetime.fromisoformat(dt_string.replace('Z', '+00:00'))
         return True
@@ -133,86 +187,243 @@ def validate_datetime_string(dt_string: str) -> bool:
         return False
 
 
-def transform_job_data(raw_data: Dict[str, Any], mapping: Dict[str, str]) -> Dict[str, Any]:
+def validate_datetime_string(dt_string: str) -> bool:
+    """Checks if a string is a valid ISO 8601 format."""
+    # Only plain strings reach the cache, so unhashable values cannot break it
+    if not isinstance(dt_string, str):
+        return False
+    return _is_iso_datetime(dt_string)
+
+
+# Lowercased strings that transform to True for boolean fields
+_TRUTHY = frozenset({'true', '1', 'yes'})
+
+
+def _to_bool(raw_value: Any) -> bool:
+    """Converts string booleans ('true', '1', 'yes') and other values to bool."""
+    if isinstance(raw_value, str):
+        return raw_value.lower() in _TRUTHY
+    return bool(raw_value)
+
+
+@lru_cache(maxsize=4096)
+def _parse_salary_string(raw_value: str) -> Any:
     """
-    Transforms raw data from a feed into our internal schema format using a mapping.
+    Parses a salary string to int or float, memoized per process.
+
+    Feeds repeat the same salary strings across many jobs, and the unparseable
+    ones ('$85,000 - $95,000') otherwise pay for two failed parses each time.
     """
-    transformed_data = {}
-    for raw_key, raw_value in raw_data.items():
-        target_key = mapping.get(raw_key, raw_key)
+    # Let int()/float() validate in a single scan instead of isdigit() first
+    try:
+        return int(raw_value)
+    except ValueError:
+        pass
+    try:
+        value = float(raw_value)
+    except ValueError:
+        return raw_value
+    # 'nan' and 'inf' parse as floats but are not salaries
+    return value if math.isfinite(value) else raw_value
+
+
+def _to_salary(raw_value: Any) -> Any:
+    """Converts numeric salary strings to int or float, leaving other values as they are."""
+    if not isinstance(raw_value, str):
+        return raw_value
+    return _parse_salary_string(raw_value)
+
+
+def _to_locations(raw_value: Any) -> Any:
+    """Converts a single location string to a one-item locations list."""
+    if isinstance(raw_value, str):
+        return [{"location": raw_value.strip()}]
+    return raw_value
+
+
+# Converters by target field; fields without one are copied unchanged
+_FIELD_CONVERTERS = {
+    'is_remote': _to_bool,
+    'is_multi_location': _to_bool,
+    'is_international': _to_bool,
+    'salary_min': _to_salary,
+    'salary_max': _to_salary,
+    'locations': _to_locations,
+}
+
+
+def compile_transform(mapping: Mapping[str, str], strict: bool = False) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Compiles a feed mapping into a transform function.
+
+    The mapping is resolved once into a plan of raw key -> (target key, converter),
+    so each call does a single dict lookup per raw field. Unmapped raw keys that
+    are already target fields map to themselves, as in transform_job_data.
+
+    With strict, a mapping target that is not a TARGET_SCHEMA field raises
+    ValueError instead of being dropped.
+    """
+    if strict:
+        unknown_targets = set(mapping.values()) - TARGET_SCHEMA.keys()
+        if unknown_targets:
+            raise ValueError(f"Mapping targets missing from TARGET_SCHEMA: {sorted(unknown_targets)}")
+
+    plan = {field: (field, _FIELD_CONVERTERS.get(field)) for field in TARGET_SCHEMA}
+    for raw_key, target_key in mapping.items():
         if target_key in TARGET_SCHEMA:
-            # Convert data types based on target schema
-            if raw_value is not None:
-                expected_type = TARGET_SCHEMA[target_key]["type"]
-                
-                # Convert string booleans
-                if target_key in ['is_remote', 'is_multi_location', 'is_international']:
-                    if isinstance(raw_value, str):
-                        transformed_data[target_key] = raw_value.lower() in ['true', '1', 'yes']
-                    else:
-                        transformed_data[target_key] = bool(raw_value)
-                
-                # Convert string numbers for salary fields
-                elif target_key in ['salary_min', 'salary_max']:
-                    if isinstance(raw_value, str) and raw_value.isdigit():
-                        transformed_data[target_key] = int(raw_value)
-                    elif isinstance(raw_value, (int, float)):
-                        transformed_data[target_key] = raw_value
-                    else:
-                        transformed_data[target_key] = raw_value
-                
-                # Handle location field - convert single string to list
-                elif target_key == 'locations':
-                    if isinstance(raw_value, str):
-                        transformed_data[target_key] = [{"location": raw_value.strip()}]
-                    elif isinstance(raw_value, list):
-                        transformed_data[target_key] = raw_value
-                    else:
-                        transformed_data[target_key] = raw_value
-                
-                else:
-                    transformed_data[target_key] = raw_value
-            else:
-                transformed_data[target_key] = raw_value
-    
-    return transformed_data
-
-
-def check_schema(job_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
+            plan[raw_key] = (target_key, _FIELD_CONVERTERS.get(target_key))
+        else:
+            plan.pop(raw_key, None)
+    plan_get = plan.get
+
+    def transform(raw_data: Dict[str, Any]) -> Dict[str, Any]:
+        transformed_data = {}
+        for raw_key, raw_value in raw_data.items():
+            step = plan_get(raw_key)
+            if step is None:
+                continue
+            target_key, convert = step
+            if convert is not None and raw_value is not None:
+                raw_value = convert(raw_value)
+            transformed_data[target_key] = raw_value
+        return transformed_data
+
+    return transform
+
+
+# Transform for the standard feed mapping, compiled once at import; every
+# feed alias must land on a target field
+transform_feed_job = compile_transform(FEED_SCHEMA_MAPPING, strict=True)
+
+
+def transform_job_data(raw_data: Dict[str, Any], mapping: Mapping[str, str]) -> Dict[str, Any]:
+    """
+    Transforms raw data from a feed into our internal schema format using a mapping.
+    """
+    if mapping is FEED_SCHEMA_MAPPING:
+        return transform_feed_job(raw_data)
+    return compile_transform(mapping)(raw_data)
+
+
+_MISSING = object()
+
+
+def _build_validator() -> Callable[[Dict[str, Any]], bool]:
+    """
+    Generates a straight-line predicate for TARGET_SCHEMA, one inlined block
+    per field, and compiles it once at import.
+
+    The predicate only answers whether a job is valid; check_schema still
+    builds the error messages for the jobs it rejects.
+    """
+    globs = {'_REQUIRED_FIELD_SET': _REQUIRED_FIELD_SET, '_MISSING': _MISSING,
+             'validate_datetime_string': validate_datetime_string}
+    src = [
+        "def _is_valid_job(d):",
+        "    if not d.keys() >= _REQUIRED_FIELD_SET:",
+        "        return False",
+    ]
+    for index, (field, (expected_type, exact_type, nullable, allowed_values)) in enumerate(_FIELD_RULES.items()):
+        if field in _REQUIRED_FIELD_SET:
+            src.append(f"    v = d[{field!r}]")
+            guard = "v is not None"
+        elif nullable:
+            src.append(f"    v = d.get({field!r})")
+            guard = "v is not None"
+        else:
+            src.append(f"    v = d.get({field!r}, _MISSING)")
+            guard = "v is not None and v is not _MISSING"
+        if not nullable:
+            src.append("    if v is None:")
+            src.append("        return False")
+        src.append(f"    if {guard}:")
+        if field in _DATETIME_FIELDS:
+            src.append("        if not isinstance(v, str) or not validate_datetime_string(v):")
+            src.append("            return False")
+            continue
+        globs[f'_T{index}'] = expected_type
+        globs[f'_X{index}'] = exact_type
+        src.append(f"        if type(v) is not _X{index} and not isinstance(v, _T{index}):")
+        src.append("            return False")
+        if allowed_values is not None:
+            globs[f'_A{index}'] = allowed_values
+            src.append(f"        if v not in _A{index}:")
+            src.append("            return False")
+    src += [
+        "    source = d.get('job_source')",
+        "    if source == 'JOB_FEED' and d.get('feed_id') is None:",
+        "        return False",
+        "    if source == 'COMPANY_WEBSITE' and d.get('feed_id') is not None:",
+        "        return False",
+        "    return True",
+    ]
+    namespace = {}
+    exec(compile('\n'.join(src), '<schema_validator>', 'exec'), globs, namespace)
+    return namespace['_is_valid_job']
+
+
+_is_valid_job = _build_validator()
+
+
+def check_schema(job_data: Dict[str, Any], fast_fail: bool = False) -> Tuple[bool, List[str]]:
     """
     Validates a transformed job data dictionary against the TARGET_SCHEMA.
+
+    With fast_fail, checks run in likely-failure order and only the first
+    error found is returned.
     """
+    # Valid jobs are the common case: answer them with the generated predicate
+    if _is_valid_job(job_data):
+        return True, []
+    return _check_schema_errors(job_data, fast_fail)
+
+
+def _check_schema_errors(job_data: Dict[str, Any], fast_fail: bool) -> Tuple[bool, List[str]]:
+    """Walks the validation plan for a job, collecting the error messages."""
     errors = []
-    
-    # Check required fields
-    for field, rules in TARGET_SCHEMA.items():
-        if rules.get("required") and field not in job_data:
-            errors.append(f"Missing required field: '{field}'")
-    
-    if errors:
+
+    # Check required fields with one set difference; report them in schema order
+    missing = _REQUIRED_FIELD_SET - job_data.keys()
+    if missing:
+        if fast_fail:
+            field = next(field for field in _REQUIRED_CHECK_ORDER if field in missing)
+            return False, [_MISSING_MESSAGES[field]]
+        errors = [_MISSING_MESSAGES[field] for field in _REQUIRED_FIELDS if field in missing]
         return False, errors
 
+    if fast_fail:
+        items = ((field, job_data[field]) for field in _FIELD_CHECK_ORDER if field in job_data)
+    else:
+        items = job_data.items()
+
     # Validate field types and values
-    for field, value in job_data.items():
-        if field in TARGET_SCHEMA:
-            rules = TARGET_SCHEMA[field]
-            expected_type = rules["type"]
+    for field, value in items:
+        if errors and fast_fail:
+            return False, errors[:1]
+        rules = _FIELD_RULES.get(field)
+        if rules is None:
+            continue
+        expected_type, exact_type, nullable, allowed_values = rules
+        
+        if value is None:
+            if not nullable:
+                errors.append(_NULL_MESSAGES[field])
+            continue
             
-            if value is None:
-                if not rules.get("nullable"):
-                    errors.append(f"Field '{field}' cannot be null.")
-                continue
-                
-            if expected_type == "datetime":
-                if not isinstance(value, str) or not validate_datetime_string(value):
-                    errors.append(f"Field '{field}' is not a valid ISO datetime string. Got: {value}")
-                continue
-                
-            if not isinstance(value, expected_type):
-                errors.append(f"Field '{field}' has incorrect type. Expected {expected_type}, got {type(value)}.")
-                
-            if "allowed_values" in rules and value not in rules["allowed_values"]:
-                errors.append(f"Field '{field}' has value '{value}', but only {rules['allowed_values']} are allowed.")
+        if field in _DATETIME_FIELDS:
+            if not isinstance(value, str) or not validate_datetime_string(value):
+                errors.append(f"{_DATETIME_MESSAGES[field]}{value}")
+            continue
+            
+        if type(value) is not exact_type and not isinstance(value, expected_type):
+            errors.append(f"{_TYPE_MESSAGES[field]}{type(value)}.")
+            
+        if allowed_values is not None and value not in allowed_values:
+            prefix, suffix = _ALLOWED_MESSAGES[field]
+            errors.append(f"{prefix}{value}{suffix}")
+
+    if errors and fast_fail:
+        return False, errors[:1]
 
     # Conditional validation
     if job_data.get("job_source") == "JOB_FEED" and job_data.get("feed_id") is None:
@@ -220,4 +431,23 @@ def check_schema(job_data: Dict[str, Any]) -> Tuple[bool, List[str]]:
     if job_data.get("job_source") == "COMPANY_WEBSITE" and job_data.get("feed_id") is not None:
         errors.append("Conditional error: 'feed_id' must be null when 'job_source' is 'COMPANY_WEBSITE'.")
 
-    return not errors, errors
\ No newline at end of file
+    return not errors, errors
+
+
+def check_schema_batch(jobs: List[Dict[str, Any]]) -> List[Tuple[bool, List[str]]]:
+    """
+    Validates many transformed jobs against the TARGET_SCHEMA.
+
+    Returns one (is_valid, errors) pair per job, in the same order as jobs,
+    exactly as check_schema would for each of them.
+    """
+    is_valid_job = _is_valid_job
+    results = []
+    append = results.append
+    for job_data in jobs:
+        if is_valid_job(job_data):
+            # Valid results carry no errors; give each its own empty list
+            append((True, []))
+        else:
+            append(_check_schema_errors(job_data, False))
+    return results
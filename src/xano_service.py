@@ -3,24 +3,68 @@ Xano service for job data synchronization.
 """
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+import orjson
 import requests
-from typing import Dict, Any
-from .config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, List, Mapping
+from .config import settings
 
 logger = logging.getLogger(__name__)
 
+# Internal fields removed from a job before it is synced
+_STRIP_KEYS = frozenset({'ai_confidence_score'})
+
+# Bulk responses meaning the endpoint does not exist
+_BULK_UNSUPPORTED_STATUSES = frozenset({404, 405})
+# Bulk responses meaning the batch was rejected unprocessed; other failures
+# (e.g. 5xx) may follow a committed write, so those jobs are not resent
+_BULK_REJECTED_STATUSES = frozenset({400, 413, 422})
+
+
+@lru_cache(maxsize=4)
+def _build_headers(api_key: str) -> Mapping[str, str]:
+    """Build the read-only request headers for an API key, once per key."""
+    return MappingProxyType({
+        'Authorization': f'Bearer {api_key}',
+        'Content-Type': 'application/json'
+    })
+
 
 class XanoService:
     """Service for Xano database operations."""
     
+    __slots__ = ('api_url', 'api_key', 'headers', '_session', '_bulk_supported')
+    
     def __init__(self):
         """Initialize the Xano service."""
-        self.api_url = Config.XANO_API_URL
-        self.api_key = Config.XANO_API_KEY
-        self.headers = {
-            'Authorization': f'Bearer {self.api_key}',
-            'Content-Type': 'application/json'
-        }
+        self.api_url = settings.xano_api_url
+        self.api_key = settings.xano_api_key
+        self.headers = _build_headers(self.api_key)
+        # Cleared once the bulk endpoint is found missing, so later batches skip it
+        self._bulk_supported = True
+        # Shared session so repeated syncs reuse pooled keep-alive connections
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        # Only failures where Xano did not process the POST are retried:
+        # connection errors and 429/503 answers. Read timeouts and 502/504 may
+        # arrive after the write committed, and a resend would duplicate jobs.
+        # POST must be listed explicitly, urllib3 only retries idempotent
+        # methods by default. The final response is returned, not raised.
+        retry = Retry(
+            total=3,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 503],
+            allowed_methods=['POST'],
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
     
     def sync_to_xano(self, job_data: Dict[str, Any]) -> bool:
         """
@@ -35,22 +79,25 @@ class XanoService:
         logger.info(f"Auto-approving and syncing job: '{job_data.get('ai_title', job_data.get('title'))}'")
         
         # Remove confidence score before syncing
-        job_copy = job_data.copy()
-        job_copy.pop('ai_confidence_score', None)
+        job_copy = {key: value for key, value in job_data.items() if key not in _STRIP_KEYS}
         
         try:
             # The endpoint for your jobs table in Xano
             jobs_endpoint = f"{self.api_url}/job_platform"
-            response = requests.post(
-                jobs_endpoint, 
-                headers=self.headers,
-                json=job_copy,
+            response = self._session.post(
+                jobs_endpoint,
+                data=orjson.dumps(job_copy),
                 timeout=30
             )
             
             if response.status_code in [200, 201]:
-                response_data = response.json()
-                logger.info(f"Successfully synced job to Xano. Record ID: {response_data.get('id', 'Unknown')}")
+                # The response body is only read for the record ID in the log line
+                if logger.isEnabledFor(logging.INFO):
+                    try:
+                        record_id = orjson.loads(response.content).get('id', 'Unknown')
+                    except (orjson.JSONDecodeError, AttributeError):
+                        record_id = 'Unknown'
+                    logger.info(f"Successfully synced job to Xano. Record ID: {record_id}")
                 return True
             else:
                 logger.error(f"Failed to sync job to Xano. Status: {response.status_code}, Response: {response.text}")
@@ -61,4 +108,80 @@ class XanoService:
             return False
         except Exception as e:
             logger.error(f"Unexpected error during Xano sync: {e}")
-            return False
\ No newline at end of file
+            return False
+    
+    def sync_many(self, jobs: List[Dict[str, Any]], max_workers: int = 8) -> List[bool]:
+        """
+        Sync jobs to Xano one request per job, with requests running concurrently.
+        
+        Args:
+            jobs: The job data to be uploaded.
+            max_workers: Number of requests in flight at once; kept within the
+                session's connection pool size.
+            
+        Returns:
+            List[bool]: Whether each job was synced, in the same order as jobs.
+        """
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            return list(executor.map(self.sync_to_xano, jobs))
+    
+    def sync_to_xano_bulk(self, jobs: List[Dict[str, Any]], batch_size: int = 50) -> List[bool]:
+        """
+        Sync many approved jobs to Xano, one request per batch of jobs.
+        
+        Falls back to one request per job if the bulk endpoint is not available
+        or rejects a batch without processing it.
+        
+        Args:
+            jobs: The job data to be uploaded.
+            batch_size: Number of jobs sent in each request.
+            
+        Returns:
+            List[bool]: Whether each job was synced, in the same order as jobs.
+        """
+        logger.info(f"Auto-approving and syncing {len(jobs)} jobs in batches of {batch_size}")
+        
+        bulk_endpoint = f"{self.api_url}/job_platform/bulk"
+        results = []
+        for start in range(0, len(jobs), batch_size):
+            chunk = jobs[start:start + batch_size]
+            if not self._bulk_supported:
+                results.extend(self.sync_many(chunk))
+                continue
+            # Remove confidence scores before syncing
+            records = [
+                {key: value for key, value in job_data.items() if key not in _STRIP_KEYS}
+                for job_data in chunk
+            ]
+            
+            try:
+                response = self._session.post(
+                    bulk_endpoint,
+                    data=orjson.dumps({"records": records}),
+                    timeout=60
+                )
+                
+                if response.status_code in [200, 201]:
+                    logger.info(f"Successfully synced {len(chunk)} jobs to Xano")
+                    results.extend([True] * len(chunk))
+                elif response.status_code in _BULK_UNSUPPORTED_STATUSES:
+                    logger.info(f"Xano bulk endpoint not available (status {response.status_code}). Syncing jobs individually.")
+                    self._bulk_supported = False
+                    results.extend(self.sync_many(chunk))
+                elif response.status_code in _BULK_REJECTED_STATUSES:
+                    logger.warning(f"Xano rejected the bulk batch. Status: {response.status_code}, Response: {response.text}. Syncing jobs individually.")
+                    results.extend(self.sync_many(chunk))
+                else:
+                    logger.error(f"Failed to sync jobs to Xano. Status: {response.status_code}, Response: {response.text}")
+                    results.extend([False] * len(chunk))
+                    
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Network error during Xano bulk sync: {e}")
+                results.extend([False] * len(chunk))
+            except Exception as e:
+                logger.error(f"Unexpected error during Xano bulk sync: {e}")
+                results.extend([False] * len(chunk))
+        
+        return results